@@ -5,7 +5,7 @@
 
 import contextlib
 import warnings
-from typing import Any, Callable, Union
+from typing import Any, Union
 
 import torch
 import torch.nn as nn
@@ -43,35 +43,38 @@ def legalize_param_sharing_between_modules(model: nn.Module, modules_to_shard: l
     # and it errors out with misleading error as it thinks it is applying FSDP on top of another parallelism.
 
     # Collect all parameters from modules to be sharded
-    modules_to_shard_params = set()
-    for module in modules_to_shard:
-        modules_to_shard_params.update(p for p in module.parameters())
+    # Membership is tracked by object id to avoid hashing nn.Parameter/nn.Module objects
+    modules_to_shard_param_ids = frozenset(id(p) for module in modules_to_shard for p in module.parameters())
 
-    visited_modules = set()
-    modules_to_shard_set = set(modules_to_shard)
+    visited_modules: set[int] = set()
+    modules_to_shard_ids = frozenset(id(module) for module in modules_to_shard)
 
     # a naive walk over model.modules wouldn't work as if a module is filtered out, we need to skip it and its children
-    # while model.modules() walk into all submodules, therefore we need to do a DFS to check for parameter sharing
-    def _check_param_sharing(module: nn.Module):
-        if module in modules_to_shard_set or module in visited_modules:
-            return
-        visited_modules.add(module)
+    # while model.modules() walk into all submodules, therefore we need to do a DFS to check for parameter sharing.
+    # The DFS uses an explicit stack so deeply nested models don't hit the recursion limit. Modules to be sharded are
+    # never pushed onto the stack, which skips them and their children.
+    if id(model) in modules_to_shard_ids:
+        return
+    stack = [model]
+    while stack:
+        module = stack.pop()
+        module_id = id(module)
+        if module_id in visited_modules:
+            continue
+        visited_modules.add(module_id)
 
         # Check if this module shares parameters with modules_to_shard
         for param in module.parameters(recurse=False):
-            if param in modules_to_shard_params:
+            if id(param) in modules_to_shard_param_ids:
                 raise ValueError(
                     f"Parameter sharing detected between modules to be sharded and module '{module}'. "
                     f'This will cause errors with FSDP. Either ensure no parameter sharing exists '
                     f'or include all modules with shared parameters in modules_to_shard.',
                 )
 
-        # Continue DFS with children
-        for child in module.children():
-            _check_param_sharing(child)
-
-    # Start the check from the root model
-    _check_param_sharing(model)
+        # Continue DFS with children, reversed so they are popped in definition order
+        children = [child for child in module.children() if id(child) not in modules_to_shard_ids]
+        stack.extend(reversed(children))
 
 
 def get_standalone_and_tied_modules(modules: list[nn.Module]) -> tuple[list[nn.Module], set[nn.Module]]:
@@ -88,64 +91,76 @@ def get_standalone_and_tied_modules(modules: list[nn.Module]) -> tuple[list[nn.M
             - list[torch.nn.Module]: Modules that don't share parameters with other modules.
             - set[torch.nn.Module]: Modules with shared/tied parameters
     """
-    # Find all tied parameters (parameters that share the same memory) between modules
-    seen_params: set[nn.Parameter] = set()
-    tied_params: set[nn.Parameter] = set()
-    for module in modules:
-        for param in module.parameters():
-            if param in seen_params:
-                tied_params.add(param)
-        # seen_params is only updated at module granularity
+    # Find all tied parameters (parameters that share the same memory) between modules in a single pass by mapping
+    # each parameter id to the index of the first module it was seen in. Seeing the same parameter in a different
+    # module marks both modules as tied.
+    param_owner: dict[int, int] = {}
+    tied_indices: set[int] = set()
+    has_params: list[bool] = []
+    for i, module in enumerate(modules):
+        module_has_params = False
         for param in module.parameters():
-            seen_params.add(param)
+            module_has_params = True
+            param_id = id(param)
+            prev = param_owner.get(param_id)
+            if prev is None:
+                param_owner[param_id] = i
+            elif prev != i:
+                tied_indices.add(i)
+                tied_indices.add(prev)
+        has_params.append(module_has_params)
 
     # if a module has tied parameters, we add it to modules_with_tied_params
-    modules_with_tied_params = set()
-    for module in modules:
-        for param in module.parameters():
-            if param in tied_params:
-                modules_with_tied_params.add(module)
-                break
+    modules_with_tied_params = {modules[i] for i in tied_indices}
 
     # Modules to shard are those that have parameters and don't have tied parameters
     modules_to_shard = [
-        module for module in modules if module not in modules_with_tied_params and
-        next(module.parameters(), None) is not None  # Filter out modules with no parameters
+        module for i, module in enumerate(modules) if module not in modules_with_tied_params and
+        has_params[i]  # Filter out modules with no parameters
     ]
 
     return modules_to_shard, modules_with_tied_params
 
 
-def _get_param_tying_groups(model: nn.Module) -> list[set[str]]:
+def _get_param_tying_groups(model: nn.Module) -> list[list[str]]:
     """Identifies groups of tied parameters within a model based on object identity.
 
     A parameter is considered tied if the same nn.Parameter object appears multiple
-    times when iterating through model.named_parameters().
+    times when iterating through model.named_parameters(). Parameters that are not tied
+    are not included in the output.
 
-    NOTE: We take the recursive approach since .named_parameters() has a weird behavior where if you do
-    m1.m2.m3.weight = m1.m2.m4.weight and then call m1.named_parameters(), it will only return the FQN for m1.m2.m3.weight
-    but not m1.m2.m4.weight.
+    NOTE: We walk every submodule and collect its direct parameters since .named_parameters() has a weird behavior
+    where if you do m1.m2.m3.weight = m1.m2.m4.weight and then call m1.named_parameters(), it will only return the FQN
+    for m1.m2.m3.weight but not m1.m2.m4.weight.
     """
-    # Map parameter object to the set of FQNs associated with it
-    param_object_to_fqns: dict[nn.Parameter, set[str]] = {}
+    # Map parameter object id to the FQNs associated with it. The model holds a reference to every parameter
+    # for the duration of this function, so the ids are stable.
+    fqns_by_id: dict[int, list[str]] = {}
 
-    def _recursive_get_params(module: nn.Module, prefix: str = '') -> None:
-        # Add parameters from current module
+    # remove_duplicate=False so that a submodule shared under multiple names contributes all of its FQNs
+    for module_name, module in model.named_modules(remove_duplicate=False):
         for name, param in module.named_parameters(recurse=False):
-            fqn = f'{prefix}.{name}' if prefix else name
-            if param not in param_object_to_fqns:
-                param_object_to_fqns[param] = set()
-            param_object_to_fqns[param].add(fqn)
+            fqn = f'{module_name}.{name}' if module_name else name
+            fqns_by_id.setdefault(id(param), []).append(fqn)
 
-        # Recursively process child modules
-        for child_name, child in module.named_children():
-            child_prefix = f'{prefix}.{child_name}' if prefix else child_name
-            _recursive_get_params(child, child_prefix)
+    # Return a list of lists, each list contains the FQNs for a tied parameter group
+    return [group for group in fqns_by_id.values() if len(group) > 1]
 
-    _recursive_get_params(model)
 
-    # Return a list of sets, each set contains the FQNs for a tied parameter group
-    return list(param_object_to_fqns.values())
+def _has_param_tying(model: nn.Module) -> bool:
+    """Returns True as soon as any parameter object is found at more than one FQN in the model.
+
+    This walks the model the same way as :func:`_get_param_tying_groups` but exits early instead of building the
+    full FQN mapping.
+    """
+    seen_param_ids: set[int] = set()
+    for _, module in model.named_modules(remove_duplicate=False):
+        for param in module.parameters(recurse=False):
+            param_id = id(param)
+            if param_id in seen_param_ids:
+                return True
+            seen_param_ids.add(param_id)
+    return False
 
 
 @contextlib.contextmanager
@@ -160,15 +175,17 @@ def check_param_tying(model: nn.Module):
     try:
         yield
     finally:
-        post_shard_tying_groups = _get_param_tying_groups(model)
-        sorted_post_shard_groups = sorted([sorted(group) for group in post_shard_tying_groups])
-
-        if sorted_pre_shard_groups != sorted_post_shard_groups:
-            raise RuntimeError(
-                f'Parameter tying relationship changed during the context.\n'
-                f'Pre-shard tying groups (object id): {sorted_pre_shard_groups}\n'
-                f'Post-shard tying groups (object id): {sorted_post_shard_groups}',
-            )
+        # Fast path for the common case of a model without tied parameters: only check that none were introduced
+        if sorted_pre_shard_groups or _has_param_tying(model):
+            post_shard_tying_groups = _get_param_tying_groups(model)
+            sorted_post_shard_groups = sorted([sorted(group) for group in post_shard_tying_groups])
+
+            if sorted_pre_shard_groups != sorted_post_shard_groups:
+                raise RuntimeError(
+                    f'Parameter tying relationship changed during the context.\n'
+                    f'Pre-shard tying groups (object id): {sorted_pre_shard_groups}\n'
+                    f'Post-shard tying groups (object id): {sorted_post_shard_groups}',
+                )
 
 
 # Optimizer + FSDP2 Functions
@@ -225,8 +242,14 @@ def update_optimizer_modules(
         )
         optimizer.state.clear()
 
-    # Build a mapping from parameter name to sharded parameter (after sharding)
+    # Build a mapping from original parameter id to sharded parameter (after sharding)
+    # Note: the names of the parameters stay the same after sharding so we can match them by name.
     name_to_sharded_param = dict(model.named_parameters(recurse=True))
+    orig_param_id_to_sharded_param = {
+        id(param): name_to_sharded_param[name]
+        for param, name in orig_param_to_name.items()
+        if name in name_to_sharded_param
+    }
 
     # Create a mapping from old parameters to new DTensor parameters
     # Note: if params are tied and the same parameter is in multiple groups, pytorch will raise an error
@@ -234,18 +257,19 @@ def update_optimizer_modules(
     unseen_params = set()
     for group in optimizer.param_groups:
         for param in group['params']:
-            # Note: the names of the parameters stay the same after sharding so we can do the following.
+            sharded_param = orig_param_id_to_sharded_param.get(id(param), None)
+            if sharded_param is not None:
+                old_to_new_param[param] = sharded_param
+                continue
             param_name = orig_param_to_name.get(param, None)
             if param_name is None:
                 # This means that the parameter is not in the original model
                 # And since we don't have a way to identify the parameter name in the optimizer, we just use the id
                 unseen_params.add(f'optimizer.param_id.{id(param)}')
-            elif param_name not in name_to_sharded_param:
+            else:
                 # This means that the base model parameter is not in the sharded model
                 # This should never happen, we note this in the error message
                 unseen_params.add(f'model.param_name.{param_name}')
-            else:
-                old_to_new_param[param] = name_to_sharded_param[param_name]
 
     # Raise an error with all the parameters that were not found in the sharded model
     if len(unseen_params) > 0:
@@ -257,23 +281,30 @@ def update_optimizer_modules(
             'has not been applied correctly.',
         )
 
-    # Update param groups with new parameters
-    new_param_groups = []
+    # Update param groups with new parameters in place. The old to new mapping is one to one and the groups already
+    # passed add_param_group validation, so there is no need to clear and re-add them.
     for group in optimizer.param_groups:
-        new_group = {k: v for k, v in group.items() if k != 'params'}
-        new_params = [old_to_new_param[param] for param in group['params']]
-        new_group['params'] = new_params
-        new_param_groups.append(new_group)
-
-    # Update param groups
-    optimizer.param_groups.clear()
-    for group in new_param_groups:
-        optimizer.add_param_group(group)
+        group['params'] = [old_to_new_param[param] for param in group['params']]
 
 
 # FSDP2 Policy Functions
 
 
+def _validate_wrap_fn_result(res: Union[bool, dict[str, Any]], valid_keys: set[str]) -> None:
+    """Ensures all keys in a dict returned by a wrap_fn are valid FSDP2Config attributes.
+
+    Raises:
+        KeyError: If the returned dict contains invalid FSDP2Config keys.
+    """
+    if isinstance(res, dict):
+        invalid_keys = [key for key in res if key not in valid_keys]
+        if invalid_keys:
+            raise KeyError(
+                f'Invalid FSDP2 config keys in wrap_fn return value. Valid keys are: {valid_keys}. '
+                f'Invalid keys: {invalid_keys}',
+            )
+
+
 def generate_default_policy(parent_model: nn.Module) -> CustomPolicy:
     """Generates the default fsdp wrap policy for FSDP2.
 
@@ -295,32 +326,40 @@ def generate_default_policy(parent_model: nn.Module) -> CustomPolicy:
     Raises:
         KeyError: If a module's fsdp_wrap_fn returns a dict with invalid FSDP2Config keys.
     """
-    # Filter the specific deprecation warning to only appear once.
-    warnings.filterwarnings(
-        'once',
-        category=DeprecationWarning,
-        message='The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
-    )
-
-    def lambda_fn(current_module: nn.Module) -> Union[bool, dict[str, Any]]:
+    valid_keys = FSDP2Config.settable_attrs()
+    # Only warn once per policy about the deprecated _fsdp_wrap attribute
+    uses_fsdp_wrap_attr = False
+    parent_wrap_fn = getattr(parent_model, 'fsdp_wrap_fn', None)
+    if not callable(parent_wrap_fn):
+        parent_wrap_fn = None
+
+    def _get_wrap_decision(current_module: nn.Module) -> Union[bool, dict[str, Any]]:
+        nonlocal uses_fsdp_wrap_attr
         if hasattr(current_module, '_fsdp_wrap'):
-            warnings.warn(
-                DeprecationWarning(
-                    'The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
-                ),
-            )
+            uses_fsdp_wrap_attr = True
             return bool(current_module._fsdp_wrap)
         # TODO: make this recursive for reusability, similar to meta_init in param_init.py
-        if hasattr(parent_model, 'fsdp_wrap_fn') and isinstance(parent_model.fsdp_wrap_fn, Callable):
-            res = parent_model.fsdp_wrap_fn(current_module)
-            # Ensure all keys in the returned dict are valid FSDP2Config attributes
-            if isinstance(res, dict) and not set(res.keys()).issubset(FSDP2Config.settable_attrs()):
-                raise KeyError(
-                    f'Invalid FSDP2 config keys in wrap_fn return value. Valid keys are: {FSDP2Config.settable_attrs()}',
-                )
+        if parent_wrap_fn is not None:
+            res = parent_wrap_fn(current_module)
+            _validate_wrap_fn_result(res, valid_keys)
             return res
         return False
 
+    # Evaluate every module once up front so the policy only needs a dict lookup per module
+    cached_submodules_to_wrap: dict[nn.Module, Union[bool, dict[str, Any]]] = {
+        module: _get_wrap_decision(module) for module in parent_model.modules()
+    }
+    if uses_fsdp_wrap_attr:
+        warnings.warn(
+            DeprecationWarning(
+                'The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
+            ),
+            stacklevel=2,
+        )
+
+    def lambda_fn(current_module: nn.Module) -> Union[bool, dict[str, Any]]:
+        return cached_submodules_to_wrap.get(current_module, False)
+
     return CustomPolicy(lambda_fn)
 
 
@@ -340,13 +379,9 @@ def generate_composer_model_policy(composer_model: ComposerModel) -> CustomPolic
     Raises:
         KeyError: If a module's fsdp_wrap_fn returns a dict with invalid FSDP2Config keys.
     """
-    # Filter the specific deprecation warning to only appear once.
-    warnings.filterwarnings(
-        'once',
-        category=DeprecationWarning,
-        message='The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
-    )
-
+    valid_keys = FSDP2Config.settable_attrs()
+    # Only warn once per policy about the deprecated _fsdp_wrap attribute
+    uses_fsdp_wrap_attr = False
     cached_submodules_to_wrap: dict[nn.Module, bool | dict[str, Any]] = {composer_model: False}
     for child in composer_model.children():
         if isinstance(child, Metric | MetricCollection):
@@ -358,22 +393,23 @@ def generate_composer_model_policy(composer_model: ComposerModel) -> CustomPolic
         fsdp_wrap_fn = getattr(child, 'fsdp_wrap_fn', lambda x: cached_submodules_to_wrap.get(x, False))
         for child_module in child.modules():
             if hasattr(child_module, '_fsdp_wrap'):
-                warnings.warn(
-                    DeprecationWarning(
-                        'The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
-                    ),
-                )
+                uses_fsdp_wrap_attr = True
                 cached_submodules_to_wrap[child_module] = bool(child_module._fsdp_wrap)
             elif child_module is child:
                 continue
             else:
                 res = fsdp_wrap_fn(child_module)
-                if isinstance(res, dict) and not set(res.keys()).issubset(FSDP2Config.settable_attrs()):
-                    raise KeyError(
-                        f'Invalid FSDP2 config keys in wrap_fn return value. Valid keys are: {FSDP2Config.settable_attrs()}',
-                    )
+                _validate_wrap_fn_result(res, valid_keys)
                 cached_submodules_to_wrap[child_module] = res
 
+    if uses_fsdp_wrap_attr:
+        warnings.warn(
+            DeprecationWarning(
+                'The _fsdp_wrap attribute will be removed in a future release. Please use fsdp_wrap_fn instead.',
+            ),
+            stacklevel=2,
+        )
+
     def lambda_fn(current_module: nn.Module) -> bool | dict[str, Any]:
         return cached_submodules_to_wrap.get(current_module, False)
 
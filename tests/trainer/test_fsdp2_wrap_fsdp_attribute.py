@@ -277,8 +277,9 @@ def test_fsdp_wrap_fn_invalid_keys(world_size: int):
 
     m1.fsdp_wrap_fn = wrap_fn  # type: ignore
     opt = torch.optim.Adam(m1.parameters(), lr=0.01)
-    with pytest.raises(KeyError, match='Invalid FSDP2 config keys in wrap_fn return value. Valid keys are: {'):
+    with pytest.raises(KeyError, match='Invalid FSDP2 config keys in wrap_fn return value. Valid keys are: {') as e:
         parallelize_model(m1, fsdp2_config, opt)
+    assert "Invalid keys: ['tacos']" in str(e.value)
 
 
 @fsdp2_context
@@ -357,6 +358,39 @@ def test_check_param_tying():
             update_model(m1)
 
 
+@fsdp2_context
+def test_check_param_tying_untied_model():
+    """Test that tying weights inside the context of a model without tied weights raises an error."""
+    m1 = DeepNestedModel()
+
+    with check_param_tying(m1):  # type: ignore
+        pass
+
+    def update_model(m1):
+        m1.m2.m3.weight = m1.m5.m6.weight
+
+    with pytest.raises(RuntimeError, match='Parameter tying relationship changed during the context'):
+        with check_param_tying(m1):  # type: ignore
+            update_model(m1)
+
+
+@fsdp2_context
+def test_check_param_tying_shared_submodule():
+    """Test that a submodule registered under multiple names on the same parent counts as tied parameters."""
+    m1 = DeepNestedModel()
+    m1.m2.m4 = m1.m2.m3
+
+    with check_param_tying(m1):  # type: ignore
+        pass
+
+    def update_model(m1):
+        m1.m2.m4 = nn.Linear(10, 10)
+
+    with pytest.raises(RuntimeError, match="'m2.m3.weight', 'm2.m4.weight'"):
+        with check_param_tying(m1):  # type: ignore
+            update_model(m1)
+
+
 @fsdp2_context
 @world_size(2)
 def test_check_param_tying_fsdp_wrap(world_size: int):
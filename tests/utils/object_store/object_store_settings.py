@@ -2,9 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import contextlib
+import functools
 import os
 import pathlib
-from typing import Any
+from typing import Any, Optional
 
 import mockssh
 import moto
@@ -65,11 +66,48 @@ object_stores = [
     pytest.param(x, marks=_object_store_marks[x], id=x.__name__)
     for x in get_module_subclasses(composer.utils.object_store, ObjectStore)
     # Note: OCI, GCS, UC, and MLFlow have their own test suite, so they are exempt from being included in this one.``
-    if not issubclass(x, OCIObjectStore) and not issubclass(x, GCSObjectStore) and not issubclass(x, UCObjectStore) and
-    not issubclass(x, MLFlowObjectStore)
+    if not issubclass(x, (OCIObjectStore, GCSObjectStore, UCObjectStore, MLFlowObjectStore))
 ]
 
 
+@functools.lru_cache(maxsize=1)
+def _get_test_rsa_key_pem() -> bytes:
+    """Generate the RSA key used by the mock SFTP server once, since key generation is slow."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def _set_fake_aws_credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_SECURITY_TOKEN', 'testing')
+    monkeypatch.setenv('AWS_SESSION_TOKEN', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+@contextlib.contextmanager
+def shared_s3_mock_ctx():
+    """Start a moto S3 mock meant to be shared by several local S3 tests, yielding a boto3 client backed by it.
+
+    moto snapshots ``os.environ`` when the mock starts and restores it when the mock stops, so this must be entered
+    and exited outside of any test's ``monkeypatch`` (e.g. from a class or module scoped fixture). The fake credentials
+    are set by a monkeypatch owned by this context, so they are removed again once the mock stops. Yields None if
+    boto3 is not installed.
+    """
+    if not _BOTO3_AVAILABLE:
+        yield None
+        return
+    import boto3
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        _set_fake_aws_credentials(monkeypatch)
+        with moto.mock_aws():
+            yield boto3.client('s3')
+
+
 @contextlib.contextmanager
 def get_object_store_ctx(
     object_store_cls: type[ObjectStore],
@@ -77,18 +115,30 @@ def get_object_store_ctx(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: pathlib.Path,
     remote: bool = False,
+    s3_client: Optional[Any] = None,
 ):
     if object_store_cls is S3ObjectStore:
         pytest.importorskip('boto3')
         import boto3
         if remote:
             yield
+        elif s3_client is not None:
+            # Reuse a client from shared_s3_mock_ctx, only (re)creating and emptying the dummy bucket for this test
+            _set_fake_aws_credentials(monkeypatch)
+            bucket = object_store_kwargs['bucket']
+            try:
+                s3_client.create_bucket(Bucket=bucket)
+            except s3_client.exceptions.BucketAlreadyOwnedByYou:
+                pass
+            existing_objects = s3_client.list_objects_v2(Bucket=bucket).get('Contents', [])
+            if existing_objects:
+                s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': obj['Key']} for obj in existing_objects]},
+                )
+            yield
         else:
-            monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
-            monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
-            monkeypatch.setenv('AWS_SECURITY_TOKEN', 'testing')
-            monkeypatch.setenv('AWS_SESSION_TOKEN', 'testing')
-            monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+            _set_fake_aws_credentials(monkeypatch)
             with moto.mock_aws():
                 # create the dummy bucket
                 s3 = boto3.client('s3')
@@ -111,12 +161,7 @@ def get_object_store_ctx(
         if remote:
             pytest.skip('SFTP object store has no remote tests.')
         else:
-            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-            pem = private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
+            pem = _get_test_rsa_key_pem()
             private_key_path = tmp_path / 'test_rsa_key'
             username = object_store_kwargs['username']
             with open(private_key_path, 'wb') as private_key_file:
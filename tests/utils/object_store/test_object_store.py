@@ -4,14 +4,14 @@
 import contextlib
 import copy
 import pathlib
-from typing import Any
+from typing import Any, Optional
 from urllib.parse import urlparse
 
 import pytest
 
 from composer.utils.object_store import GCSObjectStore, LibcloudObjectStore, ObjectStore, S3ObjectStore, SFTPObjectStore
 from composer.utils.object_store.sftp_object_store import SFTPObjectStore
-from tests.utils.object_store.object_store_settings import get_object_store_ctx, object_stores
+from tests.utils.object_store.object_store_settings import get_object_store_ctx, object_stores, shared_s3_mock_ctx
 
 
 @pytest.fixture
@@ -57,6 +57,20 @@ def bucket_uri_and_kwargs(request, s3_bucket: str, s3_ephemeral_prefix: str, sft
     return bucket_uri, kwargs
 
 
+@pytest.fixture(scope='class')
+def mock_s3_client(remote: bool):
+    """A boto3 client backed by a moto S3 mock shared by the local tests of a class.
+
+    ``remote`` is a class scoped parameter, so pytest tears this fixture down before running tests with a different
+    value, ensuring the mock is never active during remote tests.
+    """
+    if remote:
+        yield None
+        return
+    with shared_s3_mock_ctx() as s3_client:
+        yield s3_client
+
+
 class MockCallback:
 
     def __init__(self, total_num_bytes: int) -> None:
@@ -75,7 +89,7 @@ class MockCallback:
 
 
 @pytest.mark.parametrize('bucket_uri_and_kwargs', object_stores, indirect=True)
-@pytest.mark.parametrize('remote', [False, pytest.param(True, marks=pytest.mark.remote)])
+@pytest.mark.parametrize('remote', [False, pytest.param(True, marks=pytest.mark.remote)], scope='class')
 class TestObjectStore:
 
     @pytest.fixture
@@ -85,6 +99,7 @@ class TestObjectStore:
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: pathlib.Path,
         remote: bool,
+        mock_s3_client: Optional[Any],
     ):
         remote_backend_name_to_class = {'s3': S3ObjectStore, 'sftp': SFTPObjectStore, 'libcloud': LibcloudObjectStore}
         bucket_uri, kwargs = bucket_uri_and_kwargs
@@ -95,6 +110,7 @@ class TestObjectStore:
             monkeypatch,
             tmp_path,
             remote=remote,
+            s3_client=mock_s3_client if remote_backend_name == 's3' else None,
         ):
             copied_config = copy.deepcopy(kwargs)
             # type error: Type[ObjectStore] is not callable